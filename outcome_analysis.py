@@ -3,7 +3,6 @@
 # -*- coding: utf-8 -*-
 
 import fractions as _fractions
-import itertools as _itertools
 import math as _math
 import sys as _sys
 
@@ -11,13 +10,12 @@ import matplotlib as _mpl
 import matplotlib.pyplot as _plt
 import numpy as _np
 import pandas as _pd
+import scipy.linalg as _sp_linalg
+import scipy.stats as _sp_stats
 
 import seaborn as _sns
 
 import yamb as _engine
-import yamb.booster as _booster
-
-_BoostedFreeColumn = _booster.boost_column(_engine.FreeColumn)
 
 _plt.style.use('seaborn')
 _sns.set_theme()
@@ -36,49 +34,136 @@ def _nice_subplots_grid (nsubs):
 
     return { 'nrows': nrows, 'ncols': ncols }
 
-def main (argv = []):
-    ## *** TEST ALL POSSIBLE OUTCOMES ***
+def _plot_density (ax, x, name = None, grid_size = 256):
+    x = _np.asarray(x)
 
-    scores = _np.zeros((n_outcomes, len(_engine.Slot)), dtype = _np.int32)
+    density, edges = _np.histogram(x, bins = 'auto', density = True)
+    ax.bar(
+        edges[:-1],
+        density,
+        width = _np.diff(edges),
+        align = 'edge',
+        alpha = 0.5
+    )
 
-    for i, o in enumerate(
-        _itertools.product(_engine.Die.sides, repeat = n_dice)
-    ):
-        aux_column = _BoostedFreeColumn(check_input = False)
-        for s in _engine.Column.fillable_slots:
-            aux_column.fill_slot(s, o)
-        aux_column.update_auto_slots()
+    # The KDE is evaluated on a fixed grid regardless of the sample size.
+    # Constant samples have no density to estimate.
+    try:
+        kde = _sp_stats.gaussian_kde(x, bw_method = 'scott')
+    except _sp_linalg.LinAlgError:
+        pass
+    else:
+        grid = _np.linspace(x.min(), x.max(), grid_size)
+        ax.plot(grid, kde(grid))
+
+    ax.set_xlabel(name)
+    ax.set_ylabel('Density')
+
+def _enumerate_outcomes (sides, n_dice):
+    sides = _np.asarray(sides)
+
+    return sides[
+        _np.indices((len(sides), ) * n_dice).reshape((n_dice, -1)).T
+    ]
+
+def _score_outcomes (outcomes, sides):
+    sides = _np.asarray(sides)
+    n = outcomes.shape[0]
+    rows = _np.arange(n)
+
+    scores = _np.zeros((n, len(_engine.Slot)), dtype = _np.int32)
+
+    counts = _np.sum(outcomes[:, :, _np.newaxis] == sides, axis = 1)
+
+    # Order faces by count and then by face value (both descending), the same
+    # way `Column._count_results` orders them.
+    order = _np.argsort(
+        -(counts * len(sides) + _np.arange(len(sides))),
+        axis = 1,
+        kind = 'stable'
+    )
+    f0 = sides[order[:, 0]]
+    f1 = sides[order[:, 1]]
+    c0 = counts[rows, order[:, 0]]
+    c1 = counts[rows, order[:, 1]]
+
+    for s in _engine.Column.number_slots:
+        scores[:, s] = counts[:, sides == s].sum(axis = 1) * int(s)
+    for s in _engine.Column.sum_slots:
+        scores[:, s] = outcomes.sum(axis = 1)
+
+    scores[:, _engine.Slot.TWO_PAIRS] = _np.where(
+        c1 >= 2,
+        2 * (f0 + f1) + 10,
+        0
+    )
+    present = counts > 0
+    for j in reversed(range(len(sides) - 4)):
+        scores[:, _engine.Slot.STRAIGHT] = _np.where(
+            _np.all(present[:, j:j + 5], axis = 1),
+            10 * sides[j] + 25,
+            scores[:, _engine.Slot.STRAIGHT]
+        )
+    scores[:, _engine.Slot.FULL_HOUSE] = _np.where(
+        (c0 >= 3) & (c1 >= 2),
+        3 * f0 + 2 * f1 + 30,
+        0
+    )
+    scores[:, _engine.Slot.CARRIAGE] = _np.where(c0 >= 4, 4 * f0 + 40, 0)
+    scores[:, _engine.Slot.YAMB] = _np.where(c0 >= 5, 5 * f0 + 50, 0)
+
+    numbers_sum = scores[:, _engine.Column.number_slots_array].sum(axis = 1)
+    numbers_sum[numbers_sum >= 60] += 30
+    scores[:, _engine.Slot.NUMBERS_SUM] = numbers_sum
+    scores[:, _engine.Slot.SUMS_DIFFERENCE] = \
+        scores[:, _engine.Slot.ONE] * (
+            scores[:, _engine.Slot.MAX] - scores[:, _engine.Slot.MIN]
+        )
+    scores[:, _engine.Slot.COLLECTIONS_SUM] = \
+        scores[:, _engine.Column.collection_slots_array].sum(axis = 1)
+    scores[:, _engine.Slot.TOTAL] = \
+        scores[:, _engine.Column.inner_auto_slots_array].sum(axis = 1)
+
+    return scores
+
+def _describe (scores, index = None):
+    quartiles = _np.percentile(scores, [ 25, 50, 75 ], axis = 0)
+
+    # Population SD is used since all possible outcomes are considered.
+    return _pd.DataFrame(
+        {
+            'count': float(scores.shape[0]),
+            'mean': scores.mean(axis = 0),
+            'std': scores.std(axis = 0, ddof = 0),
+            'min': scores.min(axis = 0).astype(_np.float64),
+            '25%': quartiles[0],
+            '50%': quartiles[1],
+            '75%': quartiles[2],
+            'max': scores.max(axis = 0).astype(_np.float64)
+        },
+        index = index
+    )
 
-        _np.copyto(scores[i], aux_column, casting = 'unsafe')
+def main (argv = []):
+    ## *** TEST ALL POSSIBLE OUTCOMES ***
 
-    scores = _pd.DataFrame(
-        scores,
-        columns = _pd.Index(list(s.name for s in _engine.Slot), name = 'Slot')
+    scores = _score_outcomes(
+        _enumerate_outcomes(_engine.Die.sides, n_dice),
+        _engine.Die.sides
     )
-    scores_sum = scores.sum(axis = 0)
-    scores_stats = scores.describe().T.copy()
-    scores_stats['std'] = scores.std(axis = 0, ddof = 0) # <- use population
-                                                         # SD since all
-                                                         # possible outcomes
-                                                         # are considered
 
+    slots = _pd.Index(list(s.name for s in _engine.Slot), name = 'Slot')
 
-    ## *** CALCULATE EXPECTED OUTCOMES ***
+    scores_stats = _describe(scores, index = slots)
+    scores_sum = scores.sum(axis = 0, dtype = _np.int64)
+    scores = _pd.DataFrame(scores, columns = slots)
 
-    expectations = _pd.DataFrame(
-        list([ s.name, 0.0, '', 0, 0 ] for s in _engine.Slot),
-        columns = [
-            'Slot_Name',
-            'Value',
-            'Fraction',
-            'Numerator',
-            'Denominator'
-        ],
-        index = _pd.RangeIndex(len(_engine.Slot), name = 'Slot_Index')
-    )
+
+    ## *** CALCULATE EXPECTED OUTCOMES ***
 
     # Auxiliary column is needed to accurately calculate auto slots based on
-    # other slots' scores.
+    # other slots' scores.  Fillable slots' sums are exact integers sharing
+    # the denominator, so fractions are only needed for the auto slots.
     aux_column = _engine.FreeColumn(check_input = False)
     for s in _engine.Column.fillable_slots:
         aux_column.scores[s] = _fractions.Fraction(
@@ -87,13 +172,17 @@ def main (argv = []):
         )
     aux_column.update_auto_slots()
 
-    for s in _engine.Slot:
-        f = aux_column[s]
-
-        expectations.loc[s, 'Value'] = float(f)
-        expectations.loc[s, 'Fraction'] = str(f)
-        expectations.loc[s, 'Numerator'] = f.numerator
-        expectations.loc[s, 'Denominator'] = f.denominator
+    expectations = list(aux_column[s] for s in _engine.Slot)
+    expectations = _pd.DataFrame(
+        {
+            'Slot_Name': list(s.name for s in _engine.Slot),
+            'Value': list(float(f) for f in expectations),
+            'Fraction': list(str(f) for f in expectations),
+            'Numerator': list(f.numerator for f in expectations),
+            'Denominator': list(f.denominator for f in expectations)
+        },
+        index = _pd.RangeIndex(len(_engine.Slot), name = 'Slot_Index')
+    )
 
 
     ## *** PLOT HISTOGRAMS ***
@@ -107,12 +196,7 @@ def main (argv = []):
 
     for s in _engine.Slot:
         ax_idx = _np.unravel_index(s, hist_ax.shape, order = ax_order)
-        _sns.histplot(
-            scores[s.name],
-            stat = 'density',
-            kde = True,
-            ax = hist_ax[ax_idx]
-        )
+        _plot_density(hist_ax[ax_idx], scores[s.name], s.name)
 
 
     ## *** OUTPUT RESULTS ***
@@ -9,65 +9,145 @@ import numpy as _np
 import scipy as _sp
 import scipy.special as _sp_special
 
+_nb = None
+try:
+    import numba as _nb
+except ImportError:
+    pass
+
 import yamb as _engine
 
 _nan = float('nan') # math.nan, numpy.nan
 _posinf = float('inf') # math.inf, numpy.inf
 _neginf = -_posinf # numpy.NINF
 
-_max_cache_size = 0x20
+_max_cache_size = 0x100
+
+# The engine keeps slot arrays as `int32`, which NumPy would convert to `intp`
+# on every fancy indexing.
+_fillable_slots_array = _np.array(
+    _engine.Column.fillable_slots_array,
+    dtype = _np.intp
+)
+_fillable_slots_array.flags.writeable = False
+_n_fillable_slots = len(_fillable_slots_array)
+_n_auto_slots = len(_engine.Column.auto_slots_array)
+
+_fillable_slots_indices = dict(
+    (int(s), i) for i, s in enumerate(_fillable_slots_array)
+)
+_fillable_slots_mask = _np.zeros(len(_engine.Slot), dtype = _np.bool_)
+_fillable_slots_mask[_fillable_slots_array] = True
+_fillable_slots_mask.flags.writeable = False
+
+# Roll representations are tabulated, and results representations are
+# memoised per results in a plain dictionary (the dice have only finitely many
+# outcomes), since both are looked up once per roll.
+_roll_representations = tuple(_np.array([ i ]) for i in range(0x10))
+for _r in _roll_representations:
+    _r.flags.writeable = False
+del _r
+_results_representations = dict()
+
+def _get_fillable_slots_mask (slots):
+    mask = _np.zeros(_n_fillable_slots, dtype = _np.bool_)
+    mask[list(_fillable_slots_indices[int(s)] for s in slots)] = True
+
+    return mask
+
+def identity (x, out = None):
+    if out is None or out is x:
+        return x
+
+    _np.copyto(out, x)
 
-def identity (x):
-    return x
+    return out
 
 def relu_complete (
     x,
     max_value = _posinf,
     negative_slope = 0,
-    threshold = 0
+    threshold = 0,
+    out = None
 ):
-    x, max_value, negative_slope, threshold = _np.broadcast_arrays(
-        x,
-        max_value,
-        negative_slope,
-        threshold,
-        subok = True
-    )
-
-    idx_negative = (x < threshold)
-    idx_max = (x >= max_value)
-    idx_x = ~(idx_negative | idx_max)
-
-    y = _np.zeros(
-        x.shape,
-        dtype = _np.find_common_type(
-            [ x.dtype ],
-            [ max_value.dtype, negative_slope.dtype, threshold.dtype ]
-        )
-    )
-
-    _np.subtract(
-        x,
-        threshold,
-        where = idx_negative,
-        out = y
-    )
-    _np.multiply(
-        negative_slope,
-        y,
-        where = idx_negative,
-        out = y
-    )
-    _np.copyto(y, max_value, where = idx_max)
-    _np.copyto(y, x, where = idx_x)
-
-    return y
-
-def relu (x):
-    return _np.maximum(x, 0)
+    # A plain (possibly capped) ReLU is a single clipping pass.
+    if (
+        _np.ndim(max_value) == 0 and
+        _np.ndim(negative_slope) == 0 and
+        _np.ndim(threshold) == 0 and
+        negative_slope == 0 and
+        threshold == 0 and
+        max_value >= 0
+    ):
+        return _np.clip(x, 0, max_value, out = out)
+
+    y = _np.where(x < threshold, negative_slope * (x - threshold), x)
+    y = _np.where(x >= max_value, max_value, y)
+
+    if out is None:
+        return y
+
+    _np.copyto(out, y)
+
+    return out
+
+def relu (x, out = None):
+    return _np.maximum(x, 0, out = out)
+
+def sigmoid (x, out = None):
+    return _sp_special.expit(x, out = out)
+
+def _get_offset (a, base):
+    # Offset (in items) of the view `a` into the 1-dimensional array `base`.
+    return (
+        a.__array_interface__['data'][0] -
+            base.__array_interface__['data'][0]
+    ) // base.itemsize
+
+# ONNX operators equivalent to the activation functions above.
+_onnx_activations = {
+    identity: 'Identity',
+    relu: 'Relu',
+    sigmoid: 'Sigmoid'
+}
+
+# Codes of the activation functions above for the compiled forward pass.
+_activation_codes = {
+    identity: 0,
+    relu: 1,
+    sigmoid: 2
+}
+
+if _nb is not None:
+    # Inputs may contain NaNs (e.g. representations of unfilled auto slots),
+    # so of fast math only reassociation (which lets the dot products be
+    # vectorised) and contraction into FMAs are allowed, and Python's division
+    # semantics are not used.
+    _kernel_options = {
+        'cache': True,
+        'boundscheck': False,
+        'error_model': 'numpy',
+        'fastmath': { 'reassoc', 'contract' }
+    }
+
+    @_nb.njit(**_kernel_options)
+    def _forward_kernel (x, weights, outputs, layout):
+        for l in range(layout.shape[0]):
+            A_start, rows, cols, b_start, y_start, activation = layout[l]
+
+            for i in range(rows):
+                z = weights[b_start + i]
+                for j in range(cols):
+                    z += weights[A_start + i * cols + j] * x[j]
+                if activation == 1:
+                    z = max(z, 0)
+                elif activation == 2:
+                    z = 1 / (1 + _np.exp(-z))
+                outputs[y_start + i] = z
+
+            x = outputs[y_start:y_start + rows]
 
-def sigmoid (x):
-    return _sp_special.expit(x)
+        return x
 
 class NeuralPlayer (_engine.Player):
     expected_scores = _np.array(
@@ -93,7 +173,12 @@ class NeuralPlayer (_engine.Player):
         dtype = _np.float32
     )
 
-    def _ensure_numerical_array (a, ndim = None):
+    # Running the networks through ONNX Runtime (if installed) saves a little
+    # time per decision, but building the sessions takes a few milliseconds
+    # per player, which only pays off for players playing many games.
+    use_onnx_runtime = False
+
+    def _ensure_numerical_array (a, ndim = None, dtype = None):
         if ndim is None:
             a = _np.asarray(a)
         else:
@@ -115,7 +200,10 @@ class NeuralPlayer (_engine.Player):
                 f"Expected {ndim} dimensions, got {a.ndim} instead."
             )
 
-        return _np.ascontiguousarray(a)
+        if a.flags.c_contiguous and (dtype is None or a.dtype == dtype):
+            return a
+
+        return _np.ascontiguousarray(a, dtype = dtype)
 
     @classmethod
     def _get_column (cls, columns, column_index, my_column):
@@ -129,13 +217,204 @@ class NeuralPlayer (_engine.Player):
             ].get_next_available_slots()[0] if my_slot is None else my_slot
 
     @classmethod
-    def _apply_affine_operator (cls, A, b, x):
-        return _np.dot(A, x) + b
+    def _apply_affine_operator (cls, A, b, x, out = None):
+        if out is None:
+            return _np.dot(A, x) + b
+
+        _np.dot(A, x, out = out)
+        _np.add(out, b, out = out)
+
+        return out
+
+    @classmethod
+    def _build_buffers (cls, layers):
+        # Outputs of all layers are views into a single buffer, in the order
+        # the layers are used.
+        outputs = _np.empty(
+            sum(A.shape[0] for A, _, _ in layers),
+            dtype = _np.float32
+        )
+
+        buffers = list()
+
+        i = 0
+        for A, _, _ in layers:
+            buffers.append(outputs[i:i + A.shape[0]])
+            i += A.shape[0]
+
+        return buffers
+
+    @classmethod
+    def _build_numba_transform (cls, layers, buffers = None):
+        # Only networks of known activations can be compiled, and only if
+        # Numba is available.
+        if _nb is None or not layers:
+            return None
+        if any(f not in _activation_codes for _, _, f in layers):
+            return None
+
+        # The kernel reads weights straight from the arena the layers are
+        # views into (see `_pack_layers`) and writes outputs of layers into
+        # the buffer shared by `buffers` (see `_build_buffers`).
+        weights = layers[0][0].base
+        if weights is None or any(
+            A.base is not weights or b.base is not weights
+                for A, b, _ in layers
+        ):
+            layers, = cls._pack_layers(layers)
+            weights = layers[0][0].base
+        outputs = None if buffers is None else buffers[0].base
+        if outputs is None or any(y.base is not outputs for y in buffers):
+            buffers = cls._build_buffers(layers)
+            outputs = buffers[0].base
+
+        layout = _np.zeros((len(layers), 6), dtype = _np.int64)
+        for l, ((A, b, f), y) in enumerate(zip(layers, buffers)):
+            layout[l] = (
+                _get_offset(A, weights),
+                A.shape[0],
+                A.shape[1],
+                _get_offset(b, weights),
+                _get_offset(y, outputs),
+                _activation_codes[f]
+            )
+
+        def transform (x):
+            return _forward_kernel(x, weights, outputs, layout)
+
+        return transform
+
+    @classmethod
+    def _build_transform (cls, layers, buffers = None):
+        transform = cls._build_onnx_transform(layers)
+        if transform is None:
+            transform = cls._build_numba_transform(layers, buffers)
+        if transform is not None:
+            return transform
+
+        # Layers do not change once built, so the forward pass is unrolled
+        # into straight-line code instead of looping over them.
+        namespace = { 'apply': cls._apply_affine_operator }
+        source = [ 'def transform (x):' ]
+        for i, (A, b, f) in enumerate(layers):
+            namespace[f"A{i:d}"] = A
+            namespace[f"b{i:d}"] = b
+            namespace[f"f{i:d}"] = f
+            if buffers is None:
+                source.append(f"    x = f{i:d}(apply(A{i:d}, b{i:d}, x))")
+            else:
+                namespace[f"y{i:d}"] = buffers[i]
+                source.append(
+                    f"    x = f{i:d}(apply(A{i:d}, b{i:d}, x, y{i:d}), " \
+                        f"out = y{i:d})"
+                )
+        source.append('    return x')
+
+        exec('\n'.join(source), namespace)
+
+        return namespace['transform']
+
+    @classmethod
+    def _build_onnx_transform (cls, layers):
+        # Only networks of known activations can be exported, and only if
+        # ONNX Runtime is enabled and available.  ONNX is imported only here
+        # so that it is not required unless enabled.
+        if not cls.use_onnx_runtime or not layers:
+            return None
+        if any(f not in _onnx_activations for _, _, f in layers):
+            return None
+        try:
+            import onnx as _onnx
+            import onnx.helper as _onnx_helper
+            import onnx.numpy_helper as _onnx_numpy_helper
+            import onnxruntime as _ort
+        except ImportError:
+            return None
+
+        nodes = list()
+        initializers = list()
+
+        y = 'x'
+        for i, (A, b, f) in enumerate(layers):
+            initializers.append(_onnx_numpy_helper.from_array(A, f"A{i:d}"))
+            initializers.append(_onnx_numpy_helper.from_array(b, f"b{i:d}"))
+            nodes.append(
+                _onnx_helper.make_node(
+                    'Gemm',
+                    [ y, f"A{i:d}", f"b{i:d}" ],
+                    [ f"z{i:d}" ],
+                    transB = 1
+                )
+            )
+            nodes.append(
+                _onnx_helper.make_node(
+                    _onnx_activations[f],
+                    [ f"z{i:d}" ],
+                    [ f"y{i:d}" ]
+                )
+            )
+            y = f"y{i:d}"
+
+        model = _onnx_helper.make_model(
+            _onnx_helper.make_graph(
+                nodes,
+                'transform',
+                [
+                    _onnx_helper.make_tensor_value_info(
+                        'x',
+                        _onnx.TensorProto.FLOAT,
+                        [ 1, layers[0][0].shape[1] ]
+                    )
+                ],
+                [
+                    _onnx_helper.make_tensor_value_info(
+                        y,
+                        _onnx.TensorProto.FLOAT,
+                        [ 1, layers[-1][0].shape[0] ]
+                    )
+                ],
+                initializers
+            ),
+            opset_imports = [ _onnx_helper.make_opsetid('', 13) ]
+        )
+        model.ir_version = 8
+
+        options = _ort.SessionOptions()
+        options.graph_optimization_level = \
+            _ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+
+        session = _ort.InferenceSession(
+            model.SerializeToString(),
+            sess_options = options,
+            providers = [ 'CPUExecutionProvider' ]
+        )
+
+        def transform (x):
+            return session.run(None, { 'x': x.reshape((1, -1)) })[0] \
+                .reshape(-1)
+
+        return transform
 
     @classmethod
-    def _transform (cls, layers, x):
-        for A, b, f in layers:
-            x = f(cls._apply_affine_operator(A, b, x))
+    def _transform (
+        cls,
+        layers,
+        x,
+        buffers = None,
+        transform = None
+    ):
+        x = _np.asarray(x, dtype = layers[0][0].dtype)
+
+        if transform is not None:
+            x = transform(x)
+        elif buffers is None:
+            for A, b, f in layers:
+                x = f(cls._apply_affine_operator(A, b, x))
+        else:
+            for (A, b, f), y in zip(layers, buffers):
+                x = f(cls._apply_affine_operator(A, b, x, y), out = y)
 
         return x
 
@@ -176,8 +455,8 @@ class NeuralPlayer (_engine.Player):
             except StopIteration:
                 hidden = False
 
-            A = cls._ensure_numerical_array(A, 2)
-            b = cls._ensure_numerical_array(b, 1)
+            A = cls._ensure_numerical_array(A, 2, _np.float32)
+            b = cls._ensure_numerical_array(b, 1, _np.float32)
 
             if input_size is not None and A.shape[1] != input_size:
                 raise ValueError(
@@ -205,31 +484,63 @@ class NeuralPlayer (_engine.Player):
 
         return net
 
+    @classmethod
+    def _pack_layers (cls, *nets):
+        # All weights and biases are packed into a single contiguous buffer,
+        # in the order they are used, and layers are kept as views into it.
+        # The compiled forward pass reads the buffer directly (see
+        # `_build_numba_transform`), and so does NumPy through the views;
+        # ONNX Runtime keeps a copy of its own.
+        weights = _np.empty(
+            sum(A.size + b.size for net in nets for A, b, _ in net),
+            dtype = _np.float32
+        )
+
+        packed = list()
+
+        i = 0
+        for net in nets:
+            packed_net = list()
+            for A, b, f in net:
+                A_view = weights[i:i + A.size].reshape(A.shape)
+                A_view[...] = A
+                i += A.size
+
+                b_view = weights[i:i + b.size]
+                b_view[...] = b
+                i += b.size
+
+                packed_net.append((A_view, b_view, f))
+            packed.append(packed_net)
+
+        return packed
+
     @classmethod
     @_functools.lru_cache(maxsize = _max_cache_size)
     def _get_hashable_column_representation (
         cls,
         column_type,
         scores,
-        next_available_results
+        next_available_results,
+        dtype = None,
+        expected_scores_key = None
     ):
-        scores = _np.array(scores, copy = True)
+        # `expected_scores_key` is only a part of the cache key, so that
+        # representations built for other expected scores are not reused.
+        scores = _np.array(
+            list(column_type.lambda_score if s is None else s for s in scores),
+            dtype = dtype
+        )
+        lambda_slots_mask = _np.zeros(len(_engine.Slot), dtype = _np.bool_)
+        lambda_slots_mask[list(column_type.get_lambda_slots(scores))] = True
         _np.copyto(
             scores,
             cls.expected_scores,
-            where = _np.isin(
-                _np.arange(len(_engine.Slot), dtype = _np.int32),
-                _np.intersect1d(
-                    column_type.get_lambda_slots(scores),
-                    _engine.Column.fillable_slots_array,
-                    assume_unique = True
-                ),
-                assume_unique = True
-            )
+            where = lambda_slots_mask & _fillable_slots_mask
         )
         if column_type.is_lambda(scores[_engine.Slot.NUMBERS_SUM]):
             scores[_engine.Slot.NUMBERS_SUM] = _np.sum(
-                scores[_engine.Column.fillable_slots_array]
+                scores[_fillable_slots_array]
             )
             if scores[_engine.Slot.NUMBERS_SUM] >= 60:
                 scores[_engine.Slot.NUMBERS_SUM] += 30
@@ -249,70 +560,125 @@ class NeuralPlayer (_engine.Player):
         column = _np.concatenate(
             (
                 scores,
-                _np.isin(
-                    _engine.Column.fillable_slots_array,
-                    next_available_results,
-                    assume_unique = True
-                )
+                _get_fillable_slots_mask(next_available_results)
             )
         )
 
         return column
 
     @classmethod
-    def _get_column_representation (cls, column):
+    @_functools.lru_cache(maxsize = _max_cache_size)
+    def _get_revised_column_representation (
+        cls,
+        revision,
+        column,
+        expected_scores_key = None
+    ):
+        # Undefined scores are keyed as `None` since a NaN `lambda_score` is
+        # not equal to itself and would never hit the cache.
+        scores = list(column.scores)
+        for s in column.type_.get_lambda_slots(scores):
+            scores[s] = None
+
         return cls._get_hashable_column_representation(
             column.type_,
-            tuple(column.scores),
-            tuple(column.get_next_available_slots())
+            tuple(scores),
+            tuple(column.get_next_available_slots()),
+            getattr(column.scores, 'dtype', None),
+            expected_scores_key
         )
 
+    @classmethod
+    def _get_column_representation (cls, column):
+        # Representations depend on the current expected scores, which may be
+        # reassigned (e.g. every generation when training), so they are a
+        # part of the cache key.
+        return cls._get_revised_column_representation(
+            column.revision,
+            column,
+            _np.asarray(cls.expected_scores).tobytes()
+        )
+
+    @classmethod
+    def _get_locked_columns (cls, columns, roll, announced_columns = None):
+        locked_columns = _np.zeros(len(columns), dtype = _np.bool_)
+
+        if announced_columns is not None and len(announced_columns):
+            announced_columns = _np.fromiter(
+                announced_columns,
+                dtype = _np.intp,
+                count = len(announced_columns)
+            )
+            after_rolls = _np.fromiter(
+                (columns[i].after_roll for i in announced_columns),
+                dtype = _np.float64,
+                count = len(announced_columns)
+            )
+
+            locked_columns[announced_columns] = \
+                True if roll is None else roll > after_rolls
+
+        return locked_columns
+
     @classmethod
     def _get_columns_representation (
         cls,
         columns,
         roll,
-        announced_columns = None
+        announced_columns = None,
+        out = None
     ):
         if roll is None:
             roll = _posinf
 
-        columns_representation = _np.array(
-            list(cls._get_column_representation(c) for c in columns)
-        )
+        columns_representation = out
+        if columns_representation is None:
+            columns_representation = _np.empty(
+                (len(columns), _n_auto_slots + _n_fillable_slots),
+                dtype = _np.float32
+            )
+        for i, c in enumerate(columns):
+            columns_representation[i] = cls._get_column_representation(c)
+        available_slots = \
+            columns_representation[:, _n_auto_slots:].astype(_np.bool_)
+
+        locked_columns = \
+            cls._get_locked_columns(columns, roll, announced_columns)
 
-        if announced_columns is not None:
-            for i in announced_columns:
-                if roll > columns[i].after_roll:
-                    columns_representation[
-                        i,
-                        len(_engine.Column.auto_slots_array):
-                    ] = 0
+        columns_representation[locked_columns, _n_auto_slots:] = 0
 
-        return columns_representation
+        return (columns_representation, available_slots, locked_columns)
 
     @classmethod
     @_functools.lru_cache(maxsize = _max_cache_size)
     def _get_slot_representation (cls, slot):
-        return _np.isin(
-            _engine.Column.fillable_slots_array,
-            slot,
-            assume_unique = True
-        )
+        return _get_fillable_slots_mask((slot, ))
 
     @classmethod
-    @_functools.lru_cache(maxsize = _max_cache_size)
     def _get_roll_representation (cls, roll):
+        if 0 <= roll < len(_roll_representations):
+            return _roll_representations[roll]
+
         return _np.array([ roll ])
 
     @classmethod
-    @_functools.lru_cache(maxsize = _max_cache_size)
     def _get_hashable_results_representation (cls, results):
-        bow_results = _np.zeros(len(_engine.Die.sides))
-        for r, c in _collections.Counter(results).items():
-            bow_results[r - 1] = c
+        representation = _results_representations.get(results)
+        if representation is None:
+            counts = _np.bincount(
+                _np.fromiter(results, dtype = _np.intp),
+                minlength = len(_engine.Die.sides) + 1
+            )
+            representation = counts[1:].astype(_np.float64)
+            # Unrolled results (zeros) used to be assigned to the last face
+            # by negative indexing, and (the results being sorted) the count
+            # of the last face overwrote theirs if that face was rolled.
+            if not representation[-1]:
+                representation[-1] = counts[0]
+            representation.flags.writeable = False
+            _results_representations[results] = representation
 
-        return bow_results
+        return representation
 
     @classmethod
     def _get_results_representation (cls, results):
@@ -329,48 +695,54 @@ class NeuralPlayer (_engine.Player):
         x,
         announced_columns = None,
         allow_announced_column = None,
-        roll = None
+        roll = None,
+        buffers = None,
+        available_slots = None,
+        transform = None,
+        locked_columns = None
     ):
-        if announced_columns is None:
-            announced_columns = frozenset()
-        if allow_announced_column is None:
-            allow_announced_column = _nan
+        if available_slots is None:
+            available_slots = cls._get_columns_representation(columns, roll)[1]
+        if locked_columns is None:
+            locked_columns = cls._get_locked_columns(
+                columns,
+                roll,
+                announced_columns
+            )
 
+        # Every forward pass writes its output into a fresh or preallocated
+        # C-contiguous vector, so the reshape is always a view.
         y = cls._transform(
             layers,
-            x
-        ).reshape((len(columns), len(_engine.Column.fillable_slots_array)))
-        y = _np.ascontiguousarray(y)
-        for i, c in enumerate(columns):
-            if (
-                i != allow_announced_column and
-                i in announced_columns and
-                (roll is None or roll > c.after_roll)
-            ):
-                y[i].fill(_neginf)
-            else:
-                y[
-                    i,
-                    _np.isin(
-                        _engine.Column.fillable_slots_array,
-                        c.get_next_available_slots(),
-                        assume_unique = True,
-                        invert = True
-                    )
-                ] = _neginf
+            x,
+            buffers,
+            transform
+        ).reshape((len(columns), _n_fillable_slots))
 
-        column, slot = _np.unravel_index(
-            _np.argmax(y),
-            shape = y.shape,
-            order = 'C'
-        )
-        slot = _engine.Column.fillable_slots_array[slot]
+        if (
+            allow_announced_column is not None and
+            locked_columns[allow_announced_column]
+        ):
+            locked_columns = locked_columns.copy()
+            locked_columns[allow_announced_column] = False
+
+        y[~available_slots | locked_columns[:, _np.newaxis]] = _neginf
+
+        column, slot = divmod(int(_np.argmax(y)), _n_fillable_slots)
+        slot = _fillable_slots_array[slot]
 
         return (column, slot)
 
     @classmethod
-    def _get_replace_y (cls, results, layers, x):
-        y = _np.around(cls._transform(layers, x))
+    def _get_replace_y (
+        cls,
+        results,
+        layers,
+        x,
+        buffers = None,
+        transform = None
+    ):
+        y = _np.around(cls._transform(layers, x, buffers, transform))
 
         replace = _np.ones(len(results), dtype = _np.bool_)
         for i, r in enumerate(results):
@@ -387,7 +759,7 @@ class NeuralPlayer (_engine.Player):
             n_columns * len(_engine.Slot) +
                 1 +
                 len(_engine.Die.sides),
-            n_columns * len(_engine.Column.fillable_slots_array)
+            n_columns * _n_fillable_slots
         )
 
     @classmethod
@@ -402,7 +774,7 @@ class NeuralPlayer (_engine.Player):
     @classmethod
     def calculate_locked_replace_units (cls, n_columns = 4, n_dice = 5):
         return (
-            len(_engine.Column.fillable_slots_array) +
+            _n_fillable_slots +
                 1 +
                 len(_engine.Die.sides),
             len(_engine.Die.sides)
@@ -417,8 +789,20 @@ class NeuralPlayer (_engine.Player):
         instance._column_slot_layers = None
         instance._unlocked_replace_layers = None
         instance._locked_replace_layers = None
+        instance._column_slot_buffers = None
+        instance._unlocked_replace_buffers = None
+        instance._locked_replace_buffers = None
+        instance._column_slot_x = None
+        instance._unlocked_replace_x = None
+        instance._locked_replace_x = None
+        instance._column_slot_transform = None
+        instance._unlocked_replace_transform = None
+        instance._locked_replace_transform = None
         instance._column = None
         instance._slot = None
+        instance._columns_representations = None
+        instance._roll = None
+        instance._results_representation = None
 
         return instance
 
@@ -523,8 +907,94 @@ class NeuralPlayer (_engine.Player):
             )
         )
 
+        (
+            self._column_slot_layers,
+            self._unlocked_replace_layers,
+            self._locked_replace_layers
+        ) = self._type._pack_layers(
+            self._column_slot_layers,
+            self._unlocked_replace_layers,
+            self._locked_replace_layers
+        )
+
+        self._column_slot_buffers = self._type._build_buffers(
+            self._column_slot_layers
+        )
+        self._unlocked_replace_buffers = self._type._build_buffers(
+            self._unlocked_replace_layers
+        )
+        self._locked_replace_buffers = self._type._build_buffers(
+            self._locked_replace_layers
+        )
+
+        self._column_slot_transform = self._type._build_transform(
+            self._column_slot_layers,
+            self._column_slot_buffers
+        )
+        self._unlocked_replace_transform = self._type._build_transform(
+            self._unlocked_replace_layers,
+            self._unlocked_replace_buffers
+        )
+        self._locked_replace_transform = self._type._build_transform(
+            self._locked_replace_layers,
+            self._locked_replace_buffers
+        )
+
+        # Inputs are assembled in place instead of being concatenated anew for
+        # every decision (see `observe_roll_results`).
+        self._column_slot_x = _np.empty(
+            self._column_slot_layers[0][0].shape[1],
+            dtype = self._column_slot_layers[0][0].dtype
+        )
+        self._unlocked_replace_x = _np.empty(
+            self._unlocked_replace_layers[0][0].shape[1],
+            dtype = self._unlocked_replace_layers[0][0].dtype
+        )
+        self._locked_replace_x = _np.empty(
+            self._locked_replace_layers[0][0].shape[1],
+            dtype = self._locked_replace_layers[0][0].dtype
+        )
+
         self._column = None
         self._slot = None
+        self._columns_representations = dict()
+        self._roll = None
+        self._results_representation = None
+
+    def __reduce__ (self):
+        # Compiled forward passes cannot be pickled, so players are rebuilt
+        # from their layers (e.g. when sent to worker processes).
+        return (
+            self._type,
+            (
+                list((A, b) for A, b, _ in self._column_slot_layers),
+                list((A, b) for A, b, _ in self._unlocked_replace_layers),
+                list((A, b) for A, b, _ in self._locked_replace_layers),
+                self._announced_columns,
+                self._n_columns,
+                self._n_dice,
+                self._name,
+                self._update_auto_slots,
+                self._check_input
+            )
+        )
+
+    def _get_turn_columns_representation (self, columns, roll):
+        # Representations are shared amongst the decisions made in a turn for
+        # as long as none of the columns is modified, which bumps its
+        # revision.
+        key = tuple(c.revision for c in columns) + (roll, )
+
+        representation = self._columns_representations.get(key)
+        if representation is None:
+            representation = self._type._get_columns_representation(
+                columns,
+                roll,
+                self._announced_columns
+            )
+            self._columns_representations[key] = representation
+
+        return representation
 
     def observe_roll_results (
         self,
@@ -533,7 +1003,39 @@ class NeuralPlayer (_engine.Player):
         roll,
         results
     ):
-        pass
+        self._observe_roll_results(roll, results)
+
+    def _observe_roll_results (self, roll, results):
+        # The roll and the results do not change until the next roll, and
+        # they make up the tail of every network's input, so they are written
+        # into the input buffers once per roll.  Decisions may also be asked
+        # for without observing the roll results first (e.g. outside of
+        # `Player.play`), so they are rewritten whenever they differ from the
+        # last observed ones (results representations are memoised, so equal
+        # results share one).
+        results_representation = \
+            self._type._get_results_representation(results)
+        if (
+            roll == self._roll and
+            results_representation is self._results_representation
+        ):
+            return
+
+        roll_representation = _np.concatenate(
+            (
+                self._type._get_roll_representation(roll).ravel(),
+                results_representation.ravel()
+            )
+        )
+        for x in (
+            self._column_slot_x,
+            self._unlocked_replace_x,
+            self._locked_replace_x
+        ):
+            x[-roll_representation.size:] = roll_representation
+
+        self._roll = roll
+        self._results_representation = results_representation
 
     def choose_pre_filling_action_column (
         self,
@@ -545,19 +1047,13 @@ class NeuralPlayer (_engine.Player):
         if self._announced_columns is None:
             return None
 
-        x = _np.concatenate(
-            (
-                self._type._get_columns_representation(
-                    columns,
-                    roll,
-                    self._announced_columns
-                ).ravel(),
-                self._type._get_roll_representation(roll).ravel(),
-                self._type._get_results_representation(
-                    _np.sort(results)
-                ).ravel()
-            )
-        )
+        self._observe_roll_results(roll, results)
+
+        columns_representation, available_slots, locked_columns = \
+            self._get_turn_columns_representation(columns, roll)
+
+        x = self._column_slot_x
+        x[:columns_representation.size] = columns_representation.ravel()
 
         column, slot = self._type._get_column_slot_y(
             columns,
@@ -565,7 +1061,11 @@ class NeuralPlayer (_engine.Player):
             x,
             self._announced_columns,
             self._column,
-            roll
+            roll,
+            self._column_slot_buffers,
+            available_slots,
+            self._column_slot_transform,
+            locked_columns
         )
 
         if column not in self._announced_columns:
@@ -604,24 +1104,22 @@ class NeuralPlayer (_engine.Player):
         roll,
         results
     ):
+        self._observe_roll_results(roll, results)
+
         x = None
         layers = None
+        buffers = None
+        transform = None
 
         if locked_column_index is None:
-            x = _np.concatenate(
-                (
-                    self._type._get_columns_representation(
-                        columns,
-                        roll,
-                        self._announced_columns
-                    ).ravel(),
-                    self._type._get_roll_representation(roll).ravel(),
-                    self._type._get_results_representation(
-                        _np.sort(results)
-                    ).ravel()
-                )
-            )
+            columns_representation = \
+                self._get_turn_columns_representation(columns, roll)[0]
+
+            x = self._unlocked_replace_x
+            x[:columns_representation.size] = columns_representation.ravel()
             layers = self._unlocked_replace_layers
+            buffers = self._unlocked_replace_buffers
+            transform = self._unlocked_replace_transform
         else:
             self._slot = self._type._get_slot(
                 columns,
@@ -629,35 +1127,33 @@ class NeuralPlayer (_engine.Player):
                 self._column,
                 self._slot
             )
-            x = _np.concatenate(
-                (
-                    self._type._get_slot_representation(self._slot).ravel(),
-                    self._type._get_roll_representation(roll).ravel(),
-                    self._type._get_results_representation(
-                        _np.sort(results)
-                    ).ravel()
-                )
-            )
+            slot_representation = \
+                self._type._get_slot_representation(self._slot)
+
+            x = self._locked_replace_x
+            x[:slot_representation.size] = slot_representation.ravel()
             layers = self._locked_replace_layers
+            buffers = self._locked_replace_buffers
+            transform = self._locked_replace_transform
 
-        replace = self._type._get_replace_y(results, layers, x)
+        replace = self._type._get_replace_y(
+            results,
+            layers,
+            x,
+            buffers,
+            transform
+        )
 
         return replace
 
     def choose_column_to_fill (self, columns, roll, results):
-        x = _np.concatenate(
-            (
-                self._type._get_columns_representation(
-                    columns,
-                    None,
-                    self._announced_columns
-                ).ravel(),
-                self._type._get_roll_representation(roll).ravel(),
-                self._type._get_results_representation(
-                    _np.sort(results)
-                ).ravel()
-            )
-        )
+        self._observe_roll_results(roll, results)
+
+        columns_representation, available_slots, locked_columns = \
+            self._get_turn_columns_representation(columns, None)
+
+        x = self._column_slot_x
+        x[:columns_representation.size] = columns_representation.ravel()
 
         self._column, self._slot = self._type._get_column_slot_y(
             columns,
@@ -665,7 +1161,11 @@ class NeuralPlayer (_engine.Player):
             x,
             self._announced_columns,
             self._column,
-            None
+            None,
+            self._column_slot_buffers,
+            available_slots,
+            self._column_slot_transform,
+            locked_columns
         )
 
         return self._column
@@ -691,6 +1191,8 @@ class NeuralPlayer (_engine.Player):
         self._column = 0
         self._slot = 0
 
+        self._columns_representations.clear()
+
     @property
     def n_columns (self):
         return self._n_columns
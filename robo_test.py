@@ -2,12 +2,14 @@
 
 # -*- coding: utf-8 -*-
 
+import itertools as _itertools
 import math as _math
+import multiprocessing as _multiprocessing
 import numbers as _numbers
+import os as _os
 import sys as _sys
 
 import numpy as _np
-import pandas as _pd
 
 import yamb as _engine
 import yamb.booster as _booster
@@ -47,24 +49,29 @@ def _create_random_layers (
     if random_state is None:
         random_state = _np.random.default_rng()
 
+    units = list(hidden_units) + [ output_size ]
+    sizes = list(
+        (l, i) for l, i in zip(units, [ input_size ] + units[:-1])
+    )
+
+    # All parameters are drawn at once, directly in single precision, and
+    # the layers are views of the draw.
+    parameters = random_state.standard_normal(
+        size = sum(l * i + l for l, i in sizes),
+        dtype = _np.float32
+    )
+
     layers = list()
 
-    for l in list(hidden_units) + [ output_size ]:
-        A = _np.require(
-            random_state.normal(0, 1, size = (l, input_size)),
-            dtype = _np.float32,
-            requirements = 'C'
-        )
-        b = _np.require(
-            random_state.normal(0, 1, size = l),
-            dtype = _np.float32,
-            requirements = 'C'
-        )
+    j = 0
+    for l, i in sizes:
+        A = parameters[j:j + l * i].reshape((l, i))
+        j += l * i
+        b = parameters[j:j + l]
+        j += l
 
         layers.append((A, b))
 
-        input_size = l
-
     return layers
 
 def _create_random_player (
@@ -97,6 +104,55 @@ def _create_random_player (
         check_input = False
     )
 
+def _stack_layers (players_layers):
+    # Each layer's `A` and `b` are joined into a single `(out, in + 1)`
+    # matrix, so that they are handled as one parameter, and stacked across
+    # players into an array of shape `(n, out, in + 1)`.
+    stacked_layers = list()
+
+    for j, l in enumerate(players_layers[0]):
+        W = _np.empty(
+            (len(players_layers), l[0].shape[0], l[0].shape[1] + 1),
+            dtype = l[0].dtype
+        )
+        for i, layers in enumerate(players_layers):
+            W[i, :, :-1] = layers[j][0]
+            W[i, :, -1] = layers[j][1]
+
+        stacked_layers.append(W)
+
+    return stacked_layers
+
+def _unstack_layers (stacked_layers, i):
+    return list((W[i, :, :-1], W[i, :, -1]) for W in stacked_layers)
+
+def _stack_population (players):
+    return (
+        _stack_layers(list(p.column_slot_layers for p in players)),
+        _stack_layers(list(p.unlocked_replace_layers for p in players)),
+        _stack_layers(list(p.locked_replace_layers for p in players))
+    )
+
+def _allocate_centres (population):
+    return list(
+        list(_np.empty(W.shape[1:], dtype = W.dtype) for W in layers)
+            for layers in population
+    )
+
+def _combine_parameters (stacked, centre, combo, spread, out):
+    # Parameters (see `_stack_layers`) are flattened so that all combinations
+    # of a parameter are computed by a single matrix product, written directly
+    # into the new population's parameters and then moved away from the centre
+    # in place.
+    _np.matmul(
+        combo,
+        stacked.reshape((stacked.shape[0], -1)),
+        out = out.reshape((out.shape[0], -1))
+    )
+    out -= centre
+    out *= spread
+    out += centre
+
 def _create_next_generation (
     players,
     scores,
@@ -107,8 +163,16 @@ def _create_next_generation (
     spread = 10,
     centre = _np.mean,
     centre_kwargs = { 'axis': 0, 'keepdims': False },
+    population = None,
+    centres = None,
     random_state = None
 ):
+    # Besides the new players, their stacked layers' parameters are returned
+    # (see `_stack_population`), which may be passed back as `population` for
+    # the next generation instead of restacking them from the players.
+    # Centres are computed into `centres` if given (see `_allocate_centres`),
+    # in which case `centre` must accept an `out` argument.
+
     if random_state is None:
         random_state = _np.random.default_rng()
 
@@ -120,149 +184,100 @@ def _create_next_generation (
         skip_top = 0
     if not isinstance(skip_top, (_numbers.Integral, int, _np.integer)):
         skip_top = int(round(skip_top * len(players)))
-
-    I = _np.flip(
-        _np.argsort(_np.asarray(scores))
-    )[skip_top:skip_top + top_players].copy()
-
-    players = list(players[i] for i in I)
+    if population is None:
+        population = _stack_population(players)
+
+    # Only the best players need to be sorted, so they are partitioned off
+    # first.
+    scores = _np.asarray(scores)
+    I = _np.arange(len(scores))
+    if 0 < skip_top + top_players < len(scores):
+        I = _np.argpartition(-scores, skip_top + top_players - 1)[
+            :skip_top + top_players
+        ]
+    I = I[_np.argsort(-scores[I])][skip_top:skip_top + top_players]
+
+    # Players are kept in an object array so that the top ones are gathered
+    # in a single indexing operation.
+    if not isinstance(players, _np.ndarray):
+        players_array = _np.empty(len(players), dtype = object)
+        players_array[:] = players
+        players = players_array
+    new_players = _np.empty(n_players, dtype = object)
+    new_players[:top_players] = players[I]
+    population = list(list(W[I] for W in layers) for layers in population)
 
     del I
 
-    column_slot_layers = list()
-    unlocked_replace_layers = list()
-    locked_replace_layers = list()
-    for i in range(top_players):
-        for j, l in enumerate(players[i].column_slot_layers):
-            if len(column_slot_layers) <= j:
-                column_slot_layers.append([ (l[0], l[1]) ])
-            else:
-                column_slot_layers[j].append((l[0], l[1]))
-        for j, l in enumerate(players[i].unlocked_replace_layers):
-            if len(unlocked_replace_layers) <= j:
-                unlocked_replace_layers.append([ (l[0], l[1]) ])
-            else:
-                unlocked_replace_layers[j].append((l[0], l[1]))
-        for j, l in enumerate(players[i].locked_replace_layers):
-            if len(locked_replace_layers) <= j:
-                locked_replace_layers.append([ (l[0], l[1]) ])
-            else:
-                locked_replace_layers[j].append((l[0], l[1]))
-
-    column_slot_layers_centres = list(
-        (
-            centre(
-                list(l[i][0] for i in range(top_players)),
-                **centre_kwargs
-            ),
-            centre(
-                list(l[i][1] for i in range(top_players)),
-                **centre_kwargs
-            )
-        ) for l in column_slot_layers
+    if centres is None:
+        centres = list(
+            list(centre(W, **centre_kwargs) for W in layers)
+                for layers in population
+        )
+    else:
+        for layers, layers_centres in zip(population, centres):
+            for W, C in zip(layers, layers_centres):
+                centre(W, out = C, **centre_kwargs)
+
+    combo = random_state.random(
+        size = (n_players - top_players, top_players),
+        dtype = _np.float32
     )
-    unlocked_replace_layers_centres = list(
-        (
-            centre(
-                list(l[i][0] for i in range(top_players)),
-                **centre_kwargs
-            ),
-            centre(
-                list(l[i][1] for i in range(top_players)),
-                **centre_kwargs
-            )
-        ) for l in unlocked_replace_layers
+    combo /= _np.sum(combo, axis = 1, keepdims = True)
+
+    # The new population's parameters are allocated at once and the top
+    # players' parameters are copied into their heads.  All new players'
+    # column/slot layers are then combined directly into the tails, whereas
+    # replacement layers are inherited as the centres.
+    new_population = list(
+        list(
+            _np.empty((n_players, ) + W.shape[1:], dtype = W.dtype)
+                for W in layers
+        ) for layers in population
     )
-    locked_replace_layers_centres = list(
-        (
-            centre(
-                list(l[i][0] for i in range(top_players)),
-                **centre_kwargs
-            ),
-            centre(
-                list(l[i][1] for i in range(top_players)),
-                **centre_kwargs
-            )
-        ) for l in locked_replace_layers
+    for layers, new_layers in zip(population, new_population):
+        for W, new_W in zip(layers, new_layers):
+            new_W[:top_players] = W
+    for W, C, new_W in zip(population[0], centres[0], new_population[0]):
+        _combine_parameters(W, C, combo, spread, new_W[top_players:])
+    for layers_centres, new_layers in zip(centres[1:], new_population[1:]):
+        for C, new_W in zip(layers_centres, new_layers):
+            new_W[top_players:] = C
+
+    del population
+    del centres
+
+    new_players[top_players:] = list(
+        _players.NeuralPlayer(
+            column_slot_layers = _unstack_layers(new_population[0], i),
+            unlocked_replace_layers = _unstack_layers(new_population[1], i),
+            locked_replace_layers = _unstack_layers(new_population[2], i),
+            announced_columns = 3,
+            update_auto_slots = False,
+            check_input = False
+        ) for i in range(top_players, n_players)
     )
 
-    del column_slot_layers
-    del unlocked_replace_layers
-    del locked_replace_layers
+    return (new_players, tuple(new_population))
 
-    combo = random_state.uniform(
-        0,
-        1,
-        size = (n_players - top_players, top_players)
-    ).astype(_np.float32)
-    combo /= _np.sum(combo, axis = 1, keepdims = True)
+def _play_game (args):
+    player, expected_scores, seed = args
 
-    players += list(None for _ in range(n_players - top_players))
-    for i in range(top_players, n_players):
-        column_slot_layers = list(
-            [ _np.zeros_like(l[0]), _np.zeros_like(l[1]) ]
-                for l in column_slot_layers_centres
-        )
-        unlocked_replace_layers = list(
-            [ _np.zeros_like(l[0]), _np.zeros_like(l[1]) ]
-                for l in unlocked_replace_layers_centres
-        )
-        locked_replace_layers = list(
-            [ _np.zeros_like(l[0]), _np.zeros_like(l[1]) ]
-                for l in locked_replace_layers_centres
-        )
+    # Worker processes do not share the class attribute with the main one.
+    _players.NeuralPlayer.expected_scores = expected_scores
 
-        for p, f in zip(players, combo[i - top_players]):
-            for j in range(len(column_slot_layers)):
-                for k in range(2):
-                    column_slot_layers[j][k] += f * p.column_slot_layers[j][k]
-            for j in range(len(unlocked_replace_layers_centres)):
-                for k in range(2):
-                    unlocked_replace_layers[j][k] += \
-                        f * p.unlocked_replace_layers[j][k]
-            for j in range(len(locked_replace_layers_centres)):
-                for k in range(2):
-                    locked_replace_layers[j][k] += \
-                        f * p.locked_replace_layers[j][k]
-
-            for j in range(len(column_slot_layers)):
-                for k in range(2):
-                    column_slot_layers[j][k] = \
-                        column_slot_layers_centres[j][k] + \
-                            spread * (
-                                column_slot_layers[j][k] -
-                                column_slot_layers_centres[j][k]
-                            )
-            for j in range(len(unlocked_replace_layers_centres)):
-                for k in range(2):
-                    unlocked_replace_layers[j][k] = \
-                        unlocked_replace_layers_centres[j][k] + \
-                            spread * (
-                                unlocked_replace_layers[j][k] -
-                                unlocked_replace_layers_centres[j][k]
-                            )
-            for j in range(len(locked_replace_layers_centres)):
-                for k in range(2):
-                    locked_replace_layers[j][k] = \
-                        locked_replace_layers_centres[j][k] + \
-                            spread * (
-                                locked_replace_layers[j][k] -
-                                locked_replace_layers_centres[j][k]
-                            )
-
-        players[i] = _players.NeuralPlayer(
-            column_slot_layers = column_slot_layers,
-            unlocked_replace_layers = unlocked_replace_layers_centres,
-            locked_replace_layers = locked_replace_layers_centres,
-            announced_columns = 3,
-            update_auto_slots = False,
-            check_input = False
-        )
+    game = _create_new_game(random_state = _np.random.default_rng(seed))
+    game = player.play(game)
+    game.update_auto_slots()
 
-    return players
+    return (
+        _np.stack(game.columns),
+        game.get_total_score(_engine.Slot.TOTAL)
+    )
 
 def main (argv = []):
-    R = _np.random.default_rng(2022)
+    seed_sequence = _np.random.SeedSequence(2022)
+    R = _np.random.default_rng(seed_sequence)
 
     n_players = 1000
     n_generations = 20
@@ -278,43 +293,70 @@ def main (argv = []):
             random_state = R
         ) for i in range(n_players)
     )
+    population = _stack_population(players)
+    centres = _allocate_centres(population)
+
+    # Games are independent of each other, so they are played in parallel.
+    # Each game gets its own seed spawned from the main generator's seed
+    # sequence to keep the results reproducible regardless of the scheduling.
+    n_processes = _os.cpu_count() or 1
+    chunksize = max(1, n_players // (4 * n_processes))
+
+    with _multiprocessing.Pool(n_processes) as pool:
+        for g in range(n_generations):
+            results = list(
+                pool.imap(
+                    _play_game,
+                    zip(
+                        players,
+                        _itertools.repeat(
+                            _players.NeuralPlayer.expected_scores
+                        ),
+                        seed_sequence.spawn(n_players)
+                    ),
+                    chunksize = chunksize
+                )
+            )
 
-    for g in range(n_generations):
-        columns = _np.zeros((0, len(_engine.Slot)), dtype = _np.float32)
-        scores = _np.zeros(n_players, dtype = _np.float32)
-
-        for i in range(n_players):
-            game = _create_new_game(random_state = R)
-            game = players[i].play(game)
-            game.update_auto_slots()
-
-            columns = _np.concatenate((columns, game.columns), axis = 0)
-            scores[i] = game.get_total_score(_engine.Slot.TOTAL)
-
-            del game
-
-        scores = _pd.Series(scores, name = 'Score')
-
-        print(f"Generation {g + 1:d}:")
-        print(scores.describe())
-        print('')
+            columns = _np.concatenate(list(c for c, _ in results), axis = 0)
+            scores = _np.array(
+                list(s for _, s in results),
+                dtype = _np.float32
+            )
 
-        _players.NeuralPlayer.expected_scores = _np.mean(
-            columns,
-            axis = 0,
-            keepdims = False
-        )
+            del results
+
+            # Summary statistics are printed in the layout of pandas'
+            # `Series.describe`, without building a series every generation.
+            quartiles = _np.percentile(scores, [ 0, 25, 50, 75, 100 ])
+
+            print(f"Generation {g + 1:d}:")
+            for name, value in zip(
+                [ 'count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max' ],
+                [ len(scores), _np.mean(scores), _np.std(scores, ddof = 1) ] +
+                    list(quartiles)
+            ):
+                print(f"{name:<5s} {float(value):14.6f}")
+            print('')
+
+            _players.NeuralPlayer.expected_scores = _np.mean(
+                columns,
+                axis = 0,
+                keepdims = False
+            )
 
-        players = _create_next_generation(
-            players,
-            scores,
-            top_players = top_players,
-            skip_top = skip_top,
-            n_players = n_players,
-            spread = original_spread / _math.sqrt(g + 1),
-            centre = _np.median,
-            random_state = R
-        )
+            players, population = _create_next_generation(
+                players,
+                scores,
+                top_players = top_players,
+                skip_top = skip_top,
+                n_players = n_players,
+                spread = original_spread / _math.sqrt(g + 1),
+                centre = _np.median,
+                population = population,
+                centres = centres,
+                random_state = R
+            )
 
     return 0
 
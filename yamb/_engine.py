@@ -24,6 +24,8 @@ _collections_abc = getattr(_collections, 'abc', _collections)
 import csv as _csv
 import enum as _enum
 import io as _io
+import itertools as _itertools
+import operator as _operator
 import os as _os
 import random as _random
 import sys as _sys
@@ -55,9 +57,16 @@ from ._types import \
 
 _range = xrange if _sys.version_info.major < 3 else range
 
-_iterkeys = lambda m: getattr(m, 'iterkeys', m.keys)()
-_itervalues = lambda m: getattr(m, 'itervalues', m.keys)()
-_iteritems = lambda m: getattr(m, 'iteritems', m.items)()
+if _sys.version_info.major < 3:
+    _iterkeys = lambda m: getattr(m, 'iterkeys', m.keys)()
+    _itervalues = lambda m: getattr(m, 'itervalues', m.values)()
+    _iteritems = lambda m: getattr(m, 'iteritems', m.items)()
+else:
+    _iterkeys = _operator.methodcaller('keys')
+    _itervalues = _operator.methodcaller('values')
+    _iteritems = _operator.methodcaller('items')
+
+_revisions = _itertools.count()
 
 class Die (object):
     """Represents a rollable 6-sided game die.
@@ -77,15 +86,11 @@ Notes
 The class `Die` provides a class variable `sides` which is originally a
 standard Python list of integers 1 through 6.  It is used by all dice to draw
 choices from, unless the die was initiated with a custom (pseudo-)random
-number generating function.  If NumPy backend is used (if `random_state`s of
-dice are NumPy generators), the variable may be converted to a `numpy.ndarray`
-like this:
-
-    >>> Die.sides # <- used only to demonstrate, you may skip this step
-    [1, 2, 3, 4, 5, 6]
-    >>> Die.sides = numpy.array(Die.sides)
-    >>> Die.sides # <- used only to demonstrate, you may skip this step
-    array([1, 2, 3, 4, 5, 6])
+number generating function.  The sides are read once, when a die is
+initialised, and a die with a NumPy backend (if its `random_state` is a NumPy
+generator) keeps them as a read-only `numpy.ndarray`.  Hence there is no need
+to convert the variable to a `numpy.ndarray` for NumPy backends, and changing
+the variable affects only the dice initialised afterwards.
 """
 
     sides = [ 1, 2, 3, 4, 5, 6 ]
@@ -142,30 +147,29 @@ like this:
                 )
             )
 
+        # The roller binds the sides and the random state's methods once,
+        # instead of looking them up (and, on the NumPy back-end, converting
+        # the sides to an array) on every roll.  Drawing side indices by
+        # `integers`/`randint` is exactly what NumPy's `choice` does with
+        # replacement, so the results are the same.
         if self._roller is None:
             if (
                 self._random_state is _random or
                 isinstance(self._random_state, _RandomState)
             ):
+                sides = tuple(self._type.sides)
+                choice = self._random_state.choice
                 if _sys.version_info.major < 3:
                     self._roller = \
                         lambda n: \
-                            self._random_state.choice(self._type.sides) \
-                                if n is None \
-                                    else list(
-                                        self._random_state.choice(
-                                            self._type.sides
-                                        ) for _ in _range(n)
-                                    )
+                            choice(sides) if n is None \
+                                else list(choice(sides) for _ in _range(n))
                 else:
+                    choices = self._random_state.choices
                     self._roller = \
                         lambda n: \
-                            self._random_state.choice(self._type.sides) \
-                                if n is None \
-                                    else self._random_state.choices(
-                                        self._type.sides,
-                                        k = n
-                                    )
+                            choice(sides) if n is None \
+                                else choices(sides, k = n)
             elif (
                 _np is not None and
                 (
@@ -173,13 +177,14 @@ like this:
                     isinstance(self._random_state, _NumpyRandomState)
                 )
             ):
-                self._roller = \
-                    lambda n: \
-                        self._random_state.choice(
-                            self._type.sides,
-                            size = n,
-                            replace = True
-                        )
+                sides = _np.array(self._type.sides)
+                sides.flags.writeable = False
+                integers = \
+                    self._random_state.integers \
+                        if hasattr(self._random_state, 'integers') \
+                            else self._random_state.randint
+                n_sides = len(sides)
+                self._roller = lambda n: sides[integers(0, n_sides, size = n)]
 
     def roll (self, n = None):
         """Rolls the die.
@@ -346,6 +351,58 @@ correspond to index values 1, 2, ..., 6 but also that no index is skipped.
     YAMB = 15
     COLLECTIONS_SUM = 16 # Sum of fillable collection slots
 
+# Slots in the order of their values, i. e. aligned with sequences of scores.
+_all_slots = tuple(Slot)
+
+# Evaluations of results for individual (kinds of) slots.  See `Column._evaluate`
+# for the parameters.
+
+def _evaluate_number (slot, results, counts):
+    for r, c in counts:
+        if r == slot:
+            return c * r
+    return 0
+
+def _evaluate_sum (slot, results, counts):
+    return sum(map(lambda c: c[0] * c[1], counts))
+
+def _evaluate_two_pairs (slot, results, counts):
+    # Counts are ordered descending, so the second count is the minimum.
+    return \
+        2 * (counts[0][0] + counts[1][0]) + 10 \
+            if (len(counts) >= 2 and counts[1][1] >= 2) \
+                else 0
+
+def _evaluate_straight (slot, results, counts):
+    # Results are unique and ascending, so five of them are consecutive if
+    # and only if the first and the last of them differ by 4.
+    for i in _range(len(results) - 4):
+        if results[i + 4] - results[i] == 4:
+            return 10 * results[i] + 25
+    return 0
+
+def _evaluate_full_house (slot, results, counts):
+    return \
+        3 * counts[0][0] + 2 * counts[1][0] + 30 \
+            if (
+                len(counts) >= 2 and
+                counts[0][1] >= 3 and
+                counts[1][1] >= 2
+            ) \
+                else 0
+
+def _evaluate_carriage (slot, results, counts):
+    return \
+        4 * counts[0][0] + 40 \
+            if (counts and counts[0][1] >= 4) \
+                else 0
+
+def _evaluate_yamb (slot, results, counts):
+    return \
+        5 * counts[0][0] + 50 \
+            if (counts and counts[0][1] >= 5) \
+                else 0
+
 class Column (object if _sys.version_info.major < 3 else _abc.ABC):
     """Represents a column to fill in the yamb game table.
 
@@ -437,7 +494,9 @@ Instance variables defined and used by the `Column` class are the following:
 * `_available_slots`: list of unfilled fillable slots (``None`` originally;
     see below for more information),
 * `_next_available_slots`: list of unfilled slots fillable in the next turn
-    (``None`` originally; see below for more information).
+    (``None`` originally; see below for more information),
+* `_revision`: token of the current state of the column (`int`; see the
+    `revision` property for more information).
 
 The last two instance variables are intended for optimisation of methods
 `get_available_slots` and `get_next_available_slots` respectively.  When a
@@ -451,7 +510,9 @@ pre-filling action or a post-filling action changes the availability of any of
 the two lists (e. g. for the announced column, only the announced slot is
 available after the announced up until the end of the turn), set the
 appropriate variable to ``None`` again in the corresponding method
-(`pre_filling_action` or `post_filling_action`).
+(`pre_filling_action` or `post_filling_action`).  Whenever any of the two
+variables or the scores change, a new value should be assigned to `_revision`
+as well via ``next(_revisions)``.
 
 Additional to instance properties `name`, `check_input` and `score`, any
 `Slot` value's name may be used as a property for getting the score of the
@@ -504,6 +565,22 @@ method.
     auto_slots = inner_auto_slots | outer_auto_slots
     slots = fillable_slots | auto_slots
 
+    # Evaluation functions of fillable slots, so that `_evaluate` dispatches
+    # by a single lookup instead of a chain of membership tests.
+    _slot_evaluators = dict(
+        _itertools.chain(
+            ((s, _evaluate_number) for s in number_slots),
+            ((s, _evaluate_sum) for s in sum_slots),
+            [
+                (Slot.TWO_PAIRS, _evaluate_two_pairs),
+                (Slot.STRAIGHT, _evaluate_straight),
+                (Slot.FULL_HOUSE, _evaluate_full_house),
+                (Slot.CARRIAGE, _evaluate_carriage),
+                (Slot.YAMB, _evaluate_yamb)
+            ]
+        )
+    )
+
     if _np is not None:
         number_slots_array = _np.array(
             list(sorted(number_slots)),
@@ -643,7 +720,7 @@ Returns
 list
     A list of ``len(Slot)`` empty scores (`lambda_score`).
 """
-        return list(cls.lambda_score for _ in _range(len(Slot)))
+        return [ cls.lambda_score ] * len(Slot)
 
     @classmethod
     def _ensure_roll_index (cls, roll):
@@ -699,6 +776,10 @@ Additional errors might be raised (and are not caught by the method) when
 converting an integer or a string to a `Slot` via ``Slot(slot)`` and
 ``Slot[slot.upper()]`` calls respectively.
 """
+        # Slots are most often passed as `Slot` values already.
+        if type(slot) is Slot:
+            return slot
+
         if isinstance(slot, _AnyString):
             return Slot[slot.upper()]
         if not (
@@ -752,7 +833,12 @@ converted to a `tuple` or a `list`.
                 raise ValueError("Results must be a 1-dimensional sequence.")
             if not _np.issubdtype(results.dtype, _np.integer):
                 raise TypeError("Results must be integral values.")
-            if not _np.all((results >= 1) & (results <= 6)):
+            # Bounds are checked by reductions, which need no temporary
+            # arrays, instead of elementwise comparisons.
+            if results.size and not (
+                results.min() >= 1 and
+                results.max() <= 6
+            ):
                 raise ValueError("Results must be in range [1..6].")
         else:
             for r in results:
@@ -792,15 +878,35 @@ This method assumes valid parameter type and values.  Use
 `_ensure_results_sequence` to prepare a raw dice roll results before passing
 them to this method.
 """
-        counts = _collections.Counter(results)
-        results = tuple(sorted(_iterkeys(counts)))
-        counts = tuple(
-            sorted(
-                _iteritems(counts),
-                key = lambda c: tuple(reversed(c)),
-                reverse = True
+        # Results are counted in a fixed histogram (including zeros, which
+        # may represent unrolled dice).  Listing the counts from the highest
+        # result down and stably sorting them by the count alone gives the
+        # colexicographical order.  Unexpected results (including negative
+        # ones, which would otherwise index the histogram from the end) are
+        # counted generally.
+        histogram = [ 0 ] * 7
+        try:
+            for r in results:
+                histogram[r if r >= 0 else 7] += 1
+        except IndexError:
+            counts = _collections.Counter(results)
+            results = tuple(sorted(_iterkeys(counts)))
+            counts = tuple(
+                sorted(
+                    _iteritems(counts),
+                    key = _operator.itemgetter(1, 0),
+                    reverse = True
+                )
+            )
+        else:
+            results = tuple(r for r in _range(7) if histogram[r])
+            counts = tuple(
+                sorted(
+                    ((r, histogram[r]) for r in reversed(results)),
+                    key = _operator.itemgetter(1),
+                    reverse = True
+                )
             )
-        )
 
         return (results, counts)
 
@@ -840,55 +946,15 @@ behaviour.
 Use `_count_results` method to build parameters for the method and do not
 alter them.
 """
-        if slot in cls.number_slots:
-            for r, c in counts:
-                if r == slot:
-                    return c * r
-            return 0
-        elif slot in cls.sum_slots:
-            return sum(map(lambda c: c[0] * c[1], counts))
-        elif slot == Slot.TWO_PAIRS:
-            return \
-                2 * (counts[0][0] + counts[1][0]) + 10 \
-                    if (
-                        len(counts) >= 2 and
-                        min(counts[0][1], counts[1][1]) >= 2
-                    ) \
-                        else 0
-        elif slot == Slot.STRAIGHT:
-            n = 0
-            for i in _range(1, len(results)):
-                if results[i] - results[i - 1] == 1:
-                    n += 1
-                    if n >= 4:
-                        return 10 * results[i - n] + 25
-                else:
-                    n = 0
-            return 0
-        elif slot == Slot.FULL_HOUSE:
-            return \
-                3 * counts[0][0] + 2 * counts[1][0] + 30 \
-                    if (
-                        len(counts) >= 2 and
-                        counts[0][1] >= 3 and
-                        counts[1][1] >= 2
-                    ) \
-                        else 0
-        elif slot == Slot.CARRIAGE:
-            return \
-                4 * counts[0][0] + 40 \
-                    if (counts and counts[0][1] >= 4) \
-                        else 0
-        elif slot == Slot.YAMB:
-            return \
-                5 * counts[0][0] + 50 \
-                    if (counts and counts[0][1] >= 5) \
-                        else 0
-        else:
+        try:
+            evaluate = cls._slot_evaluators[slot]
+        except KeyError:
             raise KeyError(
                 "Slot {slot} is not recognised.".format(slot = slot)
             )
 
+        return evaluate(slot, results, counts)
+
     @classmethod
     def is_lambda (cls, score):
         """Checks if the `score` is undefined (lambda score).
@@ -942,7 +1008,9 @@ Notes
 For optimisation purposes, this method does not check parameter type but only
 its values.
 """
-        return tuple(s for s in Slot if cls.is_lambda(scores[s]))
+        return tuple(
+            _itertools.compress(_all_slots, map(cls.is_lambda, scores))
+        )
 
     @classmethod
     def display (cls, columns, allow_numpy = True, allow_pandas = True):
@@ -1101,6 +1169,7 @@ apply while building the table.
         instance._slots = None
         instance._available_slots = None
         instance._next_available_slots = None
+        instance._revision = None
 
         return instance
 
@@ -1128,6 +1197,8 @@ apply while building the table.
         self._available_slots = None
         self._next_available_slots = None
 
+        self._revision = next(_revisions)
+
     def disallow_rolls (self):
         """Disallows next rolls.
 
@@ -1368,22 +1439,14 @@ unique results.  However, if method parameters are not checked (recall the
 single integer.
 """
         if self._check_input:
-            slot = self._type._ensure_slot(slot)
-            if slot not in self._type.fillable_slots:
-                raise KeyError(
-                    "Slot {slot} is auto-filled.".format(slot = slot)
-                )
-            if not self.is_slot_next_available(slot):
-                raise RuntimeError(
-                    "Slot {slot} is unavailable.".format(slot = slot)
-                )
             results = self._type._ensure_results_sequence(results)
 
+        # Results are counted once and shared by all slots' evaluations.
         results, counts = self._type._count_results(results)
 
-        for s in Slot:
-            if s in self._type.fillable_slots:
-                yield (s, self._type._evaluate(s, results, counts))
+        evaluate = self._type._evaluate
+        for s in sorted(self._type.fillable_slots):
+            yield (s, evaluate(s, results, counts))
 
     def get_available_slots (self):
         """Returns all unfilled fillable slots.
@@ -1648,9 +1711,13 @@ than a single integer.
         self._available_slots = None
         self._next_available_slots = None
 
+        self._revision = next(_revisions)
+
     def update_auto_slots (self):
         """Updates any auto-filled slots that may be filled (if all required \
 slots are filled)."""
+        updated = False
+
         if (
             self._type.is_lambda(self._slots[Slot.NUMBERS_SUM]) and
             not any(
@@ -1664,6 +1731,7 @@ slots are filled)."""
             if numbers_sum >= 60:
                 numbers_sum += 30
             self._slots[Slot.NUMBERS_SUM] = numbers_sum
+            updated = True
         if (
             self._type.is_lambda(self._slots[Slot.SUMS_DIFFERENCE]) and
             not (
@@ -1677,6 +1745,7 @@ slots are filled)."""
             self._slots[Slot.SUMS_DIFFERENCE] = \
                 self._slots[Slot.ONE] * \
                     (self._slots[Slot.MAX] - self._slots[Slot.MIN])
+            updated = True
         if (
             self._type.is_lambda(self._slots[Slot.COLLECTIONS_SUM]) and
             not any(
@@ -1687,6 +1756,7 @@ slots are filled)."""
             self._slots[Slot.COLLECTIONS_SUM] = sum(
                 self._slots[s] for s in self._type.collection_slots
             )
+            updated = True
         if (
             self._type.is_lambda(self._slots[Slot.TOTAL]) and
             not any(
@@ -1698,6 +1768,10 @@ slots are filled)."""
                 self._slots[Slot.NUMBERS_SUM] + \
                     self._slots[Slot.SUMS_DIFFERENCE] + \
                     self._slots[Slot.COLLECTIONS_SUM]
+            updated = True
+
+        if updated:
+            self._revision = next(_revisions)
 
     def requires_post_filling_action (self):
         """Checks if a post-filling action is required for the column.
@@ -1988,6 +2062,21 @@ of cheating when done during a game.  Instead, create a copy using
 """
         return self._slots
 
+    @property
+    def revision (self):
+        """Token of the current state of the column.
+
+The token changes whenever the scores or the availability of slots change
+through the column's methods.  Tokens are unique amongst all columns, so two
+equal tokens always refer to the same state of the same column.
+
+Notes
+-----
+Mutating the object returned by the `scores` property does not change the
+token.
+"""
+        return self._revision
+
     @property
     def check_input (self):
         """Flag indicating whether or not method parameters should be \
@@ -2299,6 +2388,8 @@ than a single integer.
         self._next_available_slots = None
         self._available_slots = None
 
+        self._revision = next(_revisions)
+
         self.lock()
         if self._immediately_fill:
             self.disallow_rolls()
@@ -2342,6 +2433,8 @@ can_roll : Method that checks if next rolls are allowed
         self._available_slots = None
         self._next_available_slots = None
 
+        self._revision = next(_revisions)
+
         self.unlock()
         if self._immediately_fill:
             self.allow_rolls()
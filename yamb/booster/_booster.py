@@ -63,6 +63,7 @@ from .. import \
     Slot as _Slot, \
     Column as _Column, \
     Yamb as _Yamb
+from .._engine import _revisions
 
 def boost_die (cls = _Die, class_name = None):
     """Boosts a die class by enforcing using the NumPy back-end.
@@ -161,7 +162,8 @@ to `nan`, and `_slots` is set to a `numpy.ndarray` of `float`s (this is
 achieved by overriding the `_new_empty_scores` method).  Also, the `is_lambda`
 method is implemented with the `numpy.isnan` universal function
 (`numpy.ufunc`), therefore multiple scores may be checked at once by passing
-an array-like input.
+an array-like input, which the `update_auto_slots` and `is_full` methods use
+to check all scores with a single call.
 
 The `__array__` method now simply returns the `_slots` instance variable, and
 checking for `numpy` dependency is omitted from the `to_numpy` method.  Also,
@@ -208,14 +210,16 @@ The `functools.lru_cache` decorator is applied to the following class methods:
 * `_ensure_slot`,
 * `_count_results` (actually, an auxiliary method is implemented which behaves
     the same but expects hashable arguments),
-* `_evaluate`.
+* `_evaluate`,
+* an auxiliary method which evaluates hashable results for all fillable slots
+    (used by the `evaluate_all` method).
 
-At most ``4 * max_cache_size`` intermediate argument-result pairs are stored
-at any given moment by the class through these four methods.  Total memory
+At most ``5 * max_cache_size`` intermediate argument-result pairs are stored
+at any given moment by the class through these five methods.  Total memory
 consumption depends on the size of arguments and results, but the former two
 methods should expect integers and/or maybe short strings, while the latter
-two should also expect quite small structures (flat or composite sequences) of
-integers in a standard game with 5 dice.
+three should also expect quite small structures (flat or composite sequences)
+of integers in a standard game with 5 dice.
 """
     if not (isinstance(cls, type) and issubclass(cls, _Column)):
         raise TypeError("Base class must be a column subclass.")
@@ -282,6 +286,28 @@ integers in a standard game with 5 dice.
                 counts
             )
 
+        @classmethod
+        @_functools.lru_cache(maxsize = max_cache_size)
+        def _evaluate_all_hashable_results (cls, results):
+            """Evaluates a hashable sequence `results` (e. g. a `tuple`) for \
+all fillable slots for caching purposes."""
+            results, counts = cls._count_results(results)
+
+            return tuple(
+                (s, cls._evaluate(s, results, counts))
+                    for s in sorted(cls.fillable_slots)
+            )
+
+        def evaluate_all (self, results):
+            if self._check_input:
+                results = self._type._ensure_results_sequence(results)
+
+            for item in self._type._evaluate_all_hashable_results(
+                results if isinstance(results, _AnyHashable)
+                    else tuple(results)
+            ):
+                yield item
+
         @classmethod
         def is_lambda (cls, score):
             #return _math.isnan(score)
@@ -304,6 +330,73 @@ integers in a standard game with 5 dice.
 
             return self._available_slots
 
+        def update_auto_slots (self):
+            # Lambda scores are checked for all slots at once, and the checks
+            # and the partial sums are then done on plain lists because
+            # indexing them is much cheaper than indexing small arrays.
+            lambdas = self._type.is_lambda(self._slots).tolist()
+            scores = self._slots.tolist()
+
+            updated = False
+
+            if (
+                lambdas[_Slot.NUMBERS_SUM] and
+                not any(map(lambdas.__getitem__, self._type.number_slots))
+            ):
+                numbers_sum = sum(
+                    map(scores.__getitem__, self._type.number_slots)
+                )
+                if numbers_sum >= 60:
+                    numbers_sum += 30
+                self._slots[_Slot.NUMBERS_SUM] = numbers_sum
+                scores[_Slot.NUMBERS_SUM] = numbers_sum
+                updated = True
+            if (
+                lambdas[_Slot.SUMS_DIFFERENCE] and
+                not (
+                    lambdas[_Slot.ONE] or
+                    any(map(lambdas.__getitem__, self._type.sum_slots))
+                )
+            ):
+                sums_difference = \
+                    scores[_Slot.ONE] * (scores[_Slot.MAX] - scores[_Slot.MIN])
+                self._slots[_Slot.SUMS_DIFFERENCE] = sums_difference
+                scores[_Slot.SUMS_DIFFERENCE] = sums_difference
+                updated = True
+            if (
+                lambdas[_Slot.COLLECTIONS_SUM] and
+                not any(map(lambdas.__getitem__, self._type.collection_slots))
+            ):
+                collections_sum = sum(
+                    map(scores.__getitem__, self._type.collection_slots)
+                )
+                self._slots[_Slot.COLLECTIONS_SUM] = collections_sum
+                scores[_Slot.COLLECTIONS_SUM] = collections_sum
+                updated = True
+            if (
+                lambdas[_Slot.TOTAL] and
+                not any(map(lambdas.__getitem__, self._type.fillable_slots))
+            ):
+                self._slots[_Slot.TOTAL] = \
+                    scores[_Slot.NUMBERS_SUM] + \
+                        scores[_Slot.SUMS_DIFFERENCE] + \
+                        scores[_Slot.COLLECTIONS_SUM]
+                updated = True
+
+            if updated:
+                self._revision = next(_revisions)
+
+        def is_full (self, fillable = False):
+            if self._check_input and not isinstance(fillable, _AnyBoolean):
+                raise TypeError("Fillable flag must be a boolean value.")
+
+            lambdas = self._type.is_lambda(self._slots).tolist()
+
+            return not (
+                any(map(lambdas.__getitem__, self._type.fillable_slots))
+                    if fillable else any(lambdas)
+            )
+
         def to_numpy (self):
             return self.__array__()
 